@@ -1,5 +1,5 @@
 """Rug Munch Intelligence — Coinbase AgentKit Action Provider."""
 
-from .action_provider import RugMunchActionProvider, rug_munch_action_provider
+from .action_provider import RugMunchActionProvider, rug_munch_action_provider, set_api_key
 
-__all__ = ["RugMunchActionProvider", "rug_munch_action_provider"]
+__all__ = ["RugMunchActionProvider", "rug_munch_action_provider", "set_api_key"]
@@ -16,11 +16,30 @@ Usage:
     ))
 """
 
+import asyncio
+import functools
+import hashlib
 import json
 import os
+import random
+import socket
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+import warnings
+import weakref
+from collections.abc import AsyncIterator, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
 from typing import Any
 
-import requests
+import httpcore
+import httpx
+import orjson
+from cachetools import LRUCache, TLRUCache, TTLCache
+from pydantic import BaseModel
 
 from coinbase_agentkit.action_providers.action_decorator import create_action
 from coinbase_agentkit.action_providers.action_provider import ActionProvider
@@ -38,43 +57,885 @@ from .schemas import (
 API_BASE = os.environ.get("RUG_MUNCH_API_BASE", "https://cryptorugmunch.app/api/agent/v1")
 API_KEY = os.environ.get("RUG_MUNCH_API_KEY", "")
 
+# "ttl" caches responses of actions whose schema is marked cacheable for the
+# schema's cache_ttl (RUG_MUNCH_CACHE_TTL overrides it for all), "replay" records
+# them in CACHE_DIR with no expiry so test and eval reruns, in this process or
+# later ones, are served from disk instead of the network. "off" disables the cache.
+CACHE_POLICY = os.environ.get("RUG_MUNCH_CACHE_POLICY", "ttl")
+CACHE_TTL = float(os.environ["RUG_MUNCH_CACHE_TTL"]) if "RUG_MUNCH_CACHE_TTL" in os.environ else None
+CACHE_DIR = os.environ.get(
+    "RUG_MUNCH_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "rug-munch-agentkit"),
+)
+
+# Concurrent async check_token_risk calls arriving within this window are sent
+# as a single /check-batch request once there are at least BATCH_MIN distinct
+# tokens; smaller windows go out as individual /check-risk calls. A batch is a
+# flat $0.30 against $0.04 per single check, so it only pays off from 8 tokens.
+# A window of 0 disables coalescing.
+BATCH_WINDOW = float(os.environ.get("RUG_MUNCH_BATCH_WINDOW_MS", "25")) / 1000
+BATCH_MIN = max(2, int(os.environ.get("RUG_MUNCH_BATCH_MIN", "8")))
+BATCH_MAX = 20
+
+# Transient statuses are retried with jittered exponential backoff.
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+BACKOFF_MAX = 60.0
+
+# Client-side request budget per minute; keeps bursts under the API's rate
+# limit instead of paying for 429 round-trips. 0 disables.
+RATE_LIMIT_RPM = float(os.environ.get("RUG_MUNCH_RPM", "600"))
+
+# Use uvloop for the async path when installed (pip install rug-munch-agentkit[uvloop]).
+# Set RUG_MUNCH_UVLOOP=0 to keep the default loop; a custom loop policy that is
+# already installed (e.g. by an ASGI server) is never replaced.
+USE_UVLOOP = os.environ.get("RUG_MUNCH_UVLOOP", "1") != "0"
+
+# Resolved API host addresses are reused for this many seconds across all
+# connections (sync and async). 0 disables the DNS cache.
+DNS_CACHE_TTL = float(os.environ.get("RUG_MUNCH_DNS_TTL", "60"))
+
+# (connect, read) timeout budgets in seconds per endpoint. Connects fail fast so
+# an unreachable host does not stall a fan-out; reads get what the endpoint needs.
+DEFAULT_TIMEOUT = (3.0, 10.0)
+ENDPOINT_TIMEOUTS = {
+    "/check-risk": (3.0, 10.0),
+    "/check-batch": (3.0, 30.0),
+    "/deployer": (3.0, 30.0),
+    "/holder-deepdive": (3.0, 30.0),
+    "/token-intel": (3.0, 15.0),
+    "/marcus-quick": (3.0, 60.0),
+    "/watch": (3.0, 10.0),
+}
 
-def _headers() -> dict:
-    h = {"Content-Type": "application/json"}
-    if API_KEY:
-        h["X-API-Key"] = API_KEY
-    return h
+# JSON object responses larger than this get the success field spliced into the
+# original bytes instead of being decoded and re-encoded.
+LARGE_RESPONSE_BYTES = 64 * 1024
 
+# watch_token_stream: reconnect backoff for the event stream, and the adaptive
+# interval range used when the API has no stream and we fall back to polling.
+STREAM_BACKOFF_MAX = 60.0
+POLL_INTERVAL_MIN = 5.0
+POLL_INTERVAL_MAX = 300.0
 
-def _post(path: str, data: dict, timeout: int = 30) -> str:
-    """POST to Rug Munch API, return JSON string."""
+
+# Built once and installed as client defaults; requests never rebuild headers.
+_BASE_HEADERS = {"Content-Type": "application/json"}
+if API_KEY:
+    _BASE_HEADERS["X-API-Key"] = API_KEY
+
+
+def _install_uvloop() -> None:
+    if not USE_UVLOOP or sys.platform == "win32":
+        return
     try:
-        resp = requests.post(f"{API_BASE}{path}", json=data, headers=_headers(), timeout=timeout)
-        if resp.status_code == 402:
-            return json.dumps({
-                "success": False,
-                "error": "Payment required (HTTP 402). Set RUG_MUNCH_API_KEY or use x402 payment.",
-                "pricing": "See https://cryptorugmunch.app/api/agent/v1/status",
-            })
-        resp.raise_for_status()
-        return json.dumps({"success": True, **resp.json()})
+        import uvloop
+    except ImportError:
+        return
+    with warnings.catch_warnings():
+        # Loop policies are deprecated on Python 3.14+, but still honored.
+        warnings.simplefilter("ignore", DeprecationWarning)
+        if type(asyncio.get_event_loop_policy()) is asyncio.DefaultEventLoopPolicy:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+_install_uvloop()
+
+
+def _httpx_timeout(timeout: tuple[float, float]) -> httpx.Timeout:
+    connect, read = timeout
+    return httpx.Timeout(read, connect=connect)
+
+
+_ENDPOINT_TIMEOUTS = {path: _httpx_timeout(t) for path, t in ENDPOINT_TIMEOUTS.items()}
+_DEFAULT_TIMEOUT = _httpx_timeout(DEFAULT_TIMEOUT)
+
+
+@functools.lru_cache(maxsize=1024)
+def _url(path: str) -> httpx.URL:
+    """Absolute URL for an API path, parsed once and reused.
+
+    Passing an absolute httpx.URL lets the client skip parsing and merging the
+    relative path against base_url on every request.
+    """
+    return httpx.URL(API_BASE.rstrip("/") + path)
+
+
+def _timeout_for(path: str, timeout: tuple[float, float] | None) -> httpx.Timeout:
+    """Explicit (connect, read) timeout if given, else the endpoint's budget."""
+    if timeout is not None:
+        return _httpx_timeout(timeout)
+    endpoint = "/" + path.split("/", 2)[1].split("?", 1)[0]
+    return _ENDPOINT_TIMEOUTS.get(endpoint, _DEFAULT_TIMEOUT)
+
+
+class _DNSCache:
+    """Process-wide (host, port) -> addresses cache with a fixed TTL.
+
+    Every resolved address is kept, in resolver order, so a host whose first
+    record is unreachable (typically broken IPv6) still connects.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: dict[tuple[str, int], tuple[list[str], float]] = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, host: str, port: int) -> list[str] | None:
+        with self._lock:
+            entry = self._entries.get((host, port))
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+        return None
+
+    def _store(self, host: str, port: int, infos: list) -> list[str]:
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[(host, port)] = (addresses, time.monotonic() + self.ttl)
+        return addresses
+
+    def resolve(self, host: str, port: int) -> list[str]:
+        addresses = self._lookup(host, port)
+        if addresses is None:
+            addresses = self._store(host, port, socket.getaddrinfo(host, port, type=socket.SOCK_STREAM))
+        return addresses
+
+    async def aresolve(self, host: str, port: int) -> list[str]:
+        addresses = self._lookup(host, port)
+        if addresses is None:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            addresses = self._store(host, port, infos)
+        return addresses
+
+    def prefer(self, host: str, port: int, address: str) -> None:
+        """Move an address that just connected to the front of the list."""
+        with self._lock:
+            entry = self._entries.get((host, port))
+            if entry is not None and entry[0][0] != address and address in entry[0]:
+                addresses = [address, *(other for other in entry[0] if other != address)]
+                self._entries[(host, port)] = (addresses, entry[1])
+
+    def invalidate(self, host: str, port: int) -> None:
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+
+_DNS = _DNSCache(DNS_CACHE_TTL)
+
+
+class _CachedDNSBackend(httpcore.NetworkBackend):
+    """Network backend that connects to cached addresses.
+
+    Addresses are tried in order, as an uncached connect would. The one that
+    connects goes first next time; if none does, the entry is dropped so the
+    next attempt re-resolves. TLS still uses the original hostname for SNI and
+    certificate checks, since httpcore takes that from the request origin
+    rather than the connect host.
+    """
+
+    def __init__(self, backend: httpcore.NetworkBackend):
+        self._backend = backend
+
+    def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = _DNS.resolve(host, port)
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+        error = httpcore.ConnectError(f"No addresses for {host}")
+        for address in addresses:
+            try:
+                stream = self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+            else:
+                _DNS.prefer(host, port, address)
+                return stream
+        _DNS.invalidate(host, port)
+        raise error
+
+    def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    def sleep(self, seconds):
+        self._backend.sleep(seconds)
+
+
+class _AsyncCachedDNSBackend(httpcore.AsyncNetworkBackend):
+    """Async _CachedDNSBackend."""
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend):
+        self._backend = backend
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = await _DNS.aresolve(host, port)
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+        error = httpcore.ConnectError(f"No addresses for {host}")
+        for address in addresses:
+            try:
+                stream = await self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+            else:
+                _DNS.prefer(host, port, address)
+                return stream
+        _DNS.invalidate(host, port)
+        raise error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds):
+        await self._backend.sleep(seconds)
+
+
+def _use_dns_cache(transport: httpx.BaseTransport | httpx.AsyncBaseTransport, wrapper: type) -> None:
+    """Route a transport's new connections through the shared DNS cache.
+
+    httpx has no resolver hook, so this wraps the network backend of the
+    transport's httpcore pool. That attribute is private, so it is only
+    replaced on httpcore 1.x (the series covered by tests/test_dns.py) and when
+    the pool still has the expected layout; otherwise the cache is skipped.
+    """
+    if DNS_CACHE_TTL <= 0 or not httpcore.__version__.startswith("1."):
+        return
+    pool = getattr(transport, "_pool", None)
+    if isinstance(pool, (httpcore.ConnectionPool, httpcore.AsyncConnectionPool)) and hasattr(
+        pool, "_network_backend"
+    ):
+        pool._network_backend = wrapper(pool._network_backend)
+
+
+def _proxy_mounts(transport_cls: type, **kwargs: Any) -> dict[str, Any]:
+    """Proxy transport for API_BASE from HTTP(S)_PROXY/ALL_PROXY/NO_PROXY.
+
+    httpx stops reading proxy environment variables once a custom transport is
+    passed, so the clients mount the proxy explicitly. Every request goes to
+    API_BASE, so only its scheme and host are looked up.
+    """
+    api = urllib.parse.urlsplit(API_BASE)
+    proxies = urllib.request.getproxies()
+    proxy = proxies.get(api.scheme) or proxies.get("all")
+    if not proxy or urllib.request.proxy_bypass(api.hostname or ""):
+        return {}
+    if "://" not in proxy:
+        proxy = "http://" + proxy
+    return {f"{api.scheme}://": transport_cls(proxy=httpx.Proxy(proxy), **kwargs)}
+
+
+def _make_client() -> httpx.Client:
+    """Build the shared HTTP/2 client used by every action."""
+    options = {
+        "http2": True,
+        "retries": 2,
+        "limits": httpx.Limits(max_connections=20, max_keepalive_connections=10),
+    }
+    transport = httpx.HTTPTransport(**options)
+    _use_dns_cache(transport, _CachedDNSBackend)
+    return httpx.Client(
+        base_url=API_BASE,
+        timeout=_DEFAULT_TIMEOUT,
+        headers=_BASE_HEADERS,
+        follow_redirects=True,
+        transport=transport,
+        mounts=_proxy_mounts(httpx.HTTPTransport, **options),
+    )
+
+
+# One client per process: concurrent actions multiplex over a single
+# HTTP/2 connection instead of each paying for its own TLS handshake. Built on
+# first use so importing the package does not build the client's SSL context.
+_CLIENT: httpx.Client | None = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def _client() -> httpx.Client:
+    """Return the shared sync client, building it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = _make_client()
+    return _CLIENT
+
+
+# One async client per event loop, since httpx pools are tied to the loop they
+# were first used on. Keyed weakly so an entry goes away with its loop; each
+# client is stored with the generator that closes it (see _close_at_shutdown).
+_ASYNC_CLIENTS: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, tuple[httpx.AsyncClient, AsyncIterator[None]]
+] = weakref.WeakKeyDictionary()
+_ASYNC_LOCK = threading.Lock()
+
+
+async def _close_at_shutdown(client: httpx.AsyncClient) -> AsyncIterator[None]:
+    """Close client when its loop finalizes this generator.
+
+    asyncio.run (like any loop.shutdown_asyncgens) finalizes suspended async
+    generators before closing the loop, the last point at which the client's
+    connections can still be closed on the loop that owns them.
+    """
+    try:
+        yield
+    finally:
+        await client.aclose()
+        # The started generator references its loop, so the entry must be
+        # removed explicitly for the loop to be collected.
+        loop = asyncio.get_running_loop()
+        with _ASYNC_LOCK:
+            entry = _ASYNC_CLIENTS.get(loop)
+            if entry is not None and entry[0] is client:
+                del _ASYNC_CLIENTS[loop]
+
+
+async def _async_client() -> httpx.AsyncClient:
+    """Return the async client bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _ASYNC_LOCK:
+        # Loops closed without shutting down their async generators leave their
+        # entry behind, and it keeps the loop alive; drop it.
+        for stale in [other for other in _ASYNC_CLIENTS if other.is_closed()]:
+            del _ASYNC_CLIENTS[stale]
+        entry = _ASYNC_CLIENTS.get(loop)
+        if entry is not None and not entry[0].is_closed:
+            return entry[0]
+        options = {"http2": True, "retries": 2, "limits": httpx.Limits(max_connections=50)}
+        transport = httpx.AsyncHTTPTransport(**options)
+        _use_dns_cache(transport, _AsyncCachedDNSBackend)
+        client = httpx.AsyncClient(
+            base_url=API_BASE,
+            timeout=_DEFAULT_TIMEOUT,
+            headers=_BASE_HEADERS,
+            follow_redirects=True,
+            transport=transport,
+            mounts=_proxy_mounts(httpx.AsyncHTTPTransport, **options),
+        )
+        closer = _close_at_shutdown(client)
+        _ASYNC_CLIENTS[loop] = (client, closer)
+    # Starting the generator registers it with the loop for finalization.
+    await closer.__anext__()
+    return client
+
+
+def set_api_key(api_key: str) -> None:
+    """Rotate the API key sent by all subsequent requests (empty string removes it)."""
+    global API_KEY
+    API_KEY = api_key
+    with _ASYNC_LOCK:
+        clients = [client for client, _ in _ASYNC_CLIENTS.values()]
+    if _CLIENT is not None:
+        clients.append(_CLIENT)
+    if api_key:
+        _BASE_HEADERS["X-API-Key"] = api_key
+        for client in clients:
+            client.headers["X-API-Key"] = api_key
+    else:
+        _BASE_HEADERS.pop("X-API-Key", None)
+        for client in clients:
+            client.headers.pop("X-API-Key", None)
+
+
+_SUCCESS_FIELD = b'{"success":true'
+
+
+# Response bodies are decoded and re-encoded with stdlib json: orjson turns
+# integers beyond 64 bits (raw token amounts in wei/base units) into floats.
+# orjson is only used for request bodies built from validated inputs.
+def _dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+# Pre-encoded 402 envelopes, returned as-is.
+_ERR_402_POST = _dumps({
+    "success": False,
+    "error": "Payment required (HTTP 402). Set RUG_MUNCH_API_KEY or use x402 payment.",
+    "pricing": "See https://cryptorugmunch.app/api/agent/v1/status",
+})
+_ERR_402_GET = _dumps({
+    "success": False,
+    "error": "Payment required (HTTP 402). Set RUG_MUNCH_API_KEY or use x402 payment.",
+})
+
+
+def _make_cache(ttl: float | None = None) -> LRUCache | None:
+    """Build a cache honoring RUG_MUNCH_CACHE_POLICY.
+
+    Without a fixed ttl, entries are (value, ttl) pairs that each expire after
+    their own ttl.
+    """
+    if CACHE_POLICY == "replay":
+        return LRUCache(maxsize=1024)
+    if CACHE_POLICY == "off":
+        return None
+    if ttl is None:
+        return TLRUCache(maxsize=1024, ttu=lambda _key, entry, now: now + entry[1])
+    return TTLCache(maxsize=1024, ttl=ttl)
+
+
+class _ReplayCache(LRUCache):
+    """LRU cache of response entries backed by one file per key in a directory.
+
+    Entries evicted from memory, or recorded by an earlier process, are read
+    back from disk. Keys are hex digests, so they double as file names.
+    """
+
+    def __init__(self, directory: str, maxsize: int = 1024):
+        super().__init__(maxsize=maxsize)
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def __missing__(self, key: str) -> tuple[str, None]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                entry = (f.read(), None)
+        except FileNotFoundError:
+            raise KeyError(key) from None
+        super().__setitem__(key, entry)
+        return entry
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key: str, entry: tuple[str, Any]) -> None:
+        super().__setitem__(key, entry)
+        os.makedirs(self.directory, exist_ok=True)
+        # Write then rename, so a concurrent reader never sees a partial file.
+        tmp = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(entry[0])
+        os.replace(tmp, self._path(key))
+
+
+def _cache_ttl(schema: type[BaseModel]) -> float:
+    return CACHE_TTL if CACHE_TTL is not None else schema.cache_ttl
+
+
+_CACHE = _ReplayCache(CACHE_DIR) if CACHE_POLICY == "replay" else _make_cache()
+_CACHE_LOCK = threading.Lock()
+
+
+def _cache_key(path: str, body: bytes | None, schema: type[BaseModel] | None) -> str | None:
+    """Content-address a request by path and the exact body bytes sent.
+
+    Returns None if the schema is not cacheable.
+    """
+    if _CACHE is None or schema is None or not schema.cacheable:
+        return None
+    raw = path.encode()
+    if body is not None:
+        raw += body
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _cache_get(key: str | None) -> str | None:
+    if key is None:
+        return None
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+    return None if entry is None else entry[0]
+
+
+def _cache_put(key: str | None, result: str, schema: type[BaseModel]) -> None:
+    if key is None:
+        return
+    with _CACHE_LOCK:
+        _CACHE[key] = (result, _cache_ttl(schema))
+
+
+class _TokenBucket:
+    """Token bucket refilled at rpm/60 tokens per second, bursting one second's worth.
+
+    Callers reserve tokens under a lock and sleep outside it, so the same
+    bucket paces both the sync and async helpers.
+    """
+
+    def __init__(self, rpm: float):
+        self.rate = rpm / 60
+        self.capacity = max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, n: float = 1) -> float:
+        """Take n tokens and return how many seconds to wait before using them."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= n
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self, n: float = 1) -> None:
+        wait = self.reserve(n)
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self, n: float = 1) -> None:
+        wait = self.reserve(n)
+        if wait:
+            await asyncio.sleep(wait)
+
+
+_BUCKET = _TokenBucket(RATE_LIMIT_RPM)
+
+
+# Marcus verdicts are remembered per exact question, plus the latest verdict per
+# (token_address, chain) so a refining follow-up can be answered as a delta.
+_MARCUS_VERDICTS = _make_cache(_cache_ttl(MarcusQuickSchema))
+_MARCUS_SESSIONS = _make_cache(_cache_ttl(MarcusQuickSchema))
+
+
+def _marcus_key(token_address: str, chain: str, question: str | None) -> str:
+    raw = "\x00".join((token_address, chain, question or ""))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _marcus_lookup(token_address: str, chain: str, question: str | None) -> tuple[str | None, dict | None]:
+    """Return (exact cached result, prior verdict to refine) for a Marcus question.
+
+    A prior verdict is only offered when the new question refines the last one
+    asked about the token: the last one was a general analysis, or the new
+    question extends it.
+    """
+    if _MARCUS_VERDICTS is None:
+        return None, None
+    with _CACHE_LOCK:
+        cached = _MARCUS_VERDICTS.get(_marcus_key(token_address, chain, question))
+        session = _MARCUS_SESSIONS.get((token_address, chain))
+    if cached is not None or session is None or not question:
+        return cached, None
+    prior_question = session["question"] or ""
+    if question.startswith(prior_question) and question != prior_question:
+        return None, session["verdict"]
+    return None, None
+
+
+def _marcus_remember(token_address: str, chain: str, question: str | None, result: str) -> None:
+    if _MARCUS_VERDICTS is None:
+        return
+    verdict = json.loads(result)
+    if not verdict.pop("success", False):
+        return
+    with _CACHE_LOCK:
+        _MARCUS_VERDICTS[_marcus_key(token_address, chain, question)] = result
+        _MARCUS_SESSIONS[(token_address, chain)] = {"verdict": verdict, "question": question}
+
+
+def _retry_delay(resp: httpx.Response, attempt: int) -> float:
+    """Seconds to wait before retrying resp, honoring Retry-After if sent."""
+    retry_after = resp.headers.get("Retry-After")
+    if retry_after:
+        try:
+            return min(BACKOFF_MAX, max(0.0, float(retry_after)))
+        except ValueError:
+            try:
+                wait = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                return min(BACKOFF_MAX, max(0.0, wait))
+            except (TypeError, ValueError):
+                pass
+    return min(BACKOFF_MAX, BACKOFF_FACTOR * 2 ** attempt + random.random() * 0.25)
+
+
+def _send(method: str, path: str, **kwargs: Any) -> httpx.Response:
+    """Send a rate-limited request, retrying transient failures (429/5xx)."""
+    client = _client()
+    url = _url(path)
+    for attempt in range(MAX_RETRIES):
+        _BUCKET.acquire()
+        resp = client.request(method, url, **kwargs)
+        if resp.status_code not in RETRY_STATUSES:
+            return resp
+        time.sleep(_retry_delay(resp, attempt))
+    _BUCKET.acquire()
+    return client.request(method, url, **kwargs)
+
+
+async def _asend(method: str, path: str, **kwargs: Any) -> httpx.Response:
+    """Async _send."""
+    client = await _async_client()
+    url = _url(path)
+    for attempt in range(MAX_RETRIES):
+        await _BUCKET.aacquire()
+        resp = await client.request(method, url, **kwargs)
+        if resp.status_code not in RETRY_STATUSES:
+            return resp
+        await asyncio.sleep(_retry_delay(resp, attempt))
+    await _BUCKET.aacquire()
+    return await client.request(method, url, **kwargs)
+
+
+def _envelope(resp: httpx.Response, payment_required: str) -> str:
+    """Wrap an API response in the {"success": ...} envelope actions return.
+
+    Bodies are parsed, and a "success" field sent by the server is kept; when
+    there is none, it is added first. Large JSON objects (holder deep-dives,
+    token intel) are only validated, with orjson, and the field is spliced into
+    the original bytes, which gives the same result without re-encoding them.
+    Invalid bodies raise, so callers report an error and cache nothing.
+    """
+    if resp.status_code == 402:
+        return payment_required
+    resp.raise_for_status()
+    body = resp.content.strip()
+    if len(body) > LARGE_RESPONSE_BYTES and body[:1] == b"{":
+        try:
+            # Validation only: orjson turns big integers into floats, but the
+            # original bytes are what is returned.
+            parsed = orjson.loads(body)
+        except orjson.JSONDecodeError:
+            parsed = None  # Possibly valid for stdlib json (NaN, huge numbers).
+        if parsed is not None:
+            if "success" in parsed:
+                return body.decode()
+            rest = body[1:].lstrip()
+            return (_SUCCESS_FIELD + (b"" if rest[:1] == b"}" else b",") + rest).decode()
+    payload = json.loads(body)
+    if "success" not in payload:
+        payload = {"success": True, **payload}
+    return _dumps(payload)
+
+
+def _post(
+    path: str,
+    data: dict,
+    timeout: tuple[float, float] | None = None,
+    schema: type[BaseModel] | None = None,
+) -> str:
+    """POST to Rug Munch API, return JSON string.
+
+    Responses are cached when ``schema`` (the calling action's input schema)
+    is marked cacheable.
+    """
+    return _post_raw(path, orjson.dumps(data), timeout, schema)
+
+
+def _post_raw(
+    path: str,
+    body: bytes,
+    timeout: tuple[float, float] | None = None,
+    schema: type[BaseModel] | None = None,
+) -> str:
+    """_post with an already-encoded JSON body (e.g. from model_dump_json)."""
+    key = _cache_key(path, body, schema)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    try:
+        resp = _send("POST", path, content=body, timeout=_timeout_for(path, timeout))
+        result = _envelope(resp, _ERR_402_POST)
+        if resp.is_success:
+            _cache_put(key, result, schema)
+        return result
+    except Exception as e:
+        return _dumps({"success": False, "error": str(e)})
+
+
+def _get(
+    path: str,
+    timeout: tuple[float, float] | None = None,
+    schema: type[BaseModel] | None = None,
+) -> str:
+    """GET from Rug Munch API, return JSON string; cached like _post."""
+    key = _cache_key(path, None, schema)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    try:
+        resp = _send("GET", path, timeout=_timeout_for(path, timeout))
+        result = _envelope(resp, _ERR_402_GET)
+        if resp.is_success:
+            _cache_put(key, result, schema)
+        return result
+    except Exception as e:
+        return _dumps({"success": False, "error": str(e)})
+
+
+async def _apost(
+    path: str,
+    data: dict,
+    timeout: tuple[float, float] | None = None,
+    schema: type[BaseModel] | None = None,
+) -> str:
+    """Async POST to Rug Munch API, return JSON string."""
+    return await _apost_raw(path, orjson.dumps(data), timeout, schema)
+
+
+async def _apost_raw(
+    path: str,
+    body: bytes,
+    timeout: tuple[float, float] | None = None,
+    schema: type[BaseModel] | None = None,
+) -> str:
+    """_apost with an already-encoded JSON body (e.g. from model_dump_json)."""
+    key = _cache_key(path, body, schema)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    try:
+        resp = await _asend("POST", path, content=body, timeout=_timeout_for(path, timeout))
+        result = _envelope(resp, _ERR_402_POST)
+        if resp.is_success:
+            _cache_put(key, result, schema)
+        return result
     except Exception as e:
-        return json.dumps({"success": False, "error": str(e)})
+        return _dumps({"success": False, "error": str(e)})
 
 
-def _get(path: str, timeout: int = 30) -> str:
-    """GET from Rug Munch API, return JSON string."""
+async def _aget(
+    path: str,
+    timeout: tuple[float, float] | None = None,
+    schema: type[BaseModel] | None = None,
+) -> str:
+    """Async GET from Rug Munch API, return JSON string."""
+    key = _cache_key(path, None, schema)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
     try:
-        resp = requests.get(f"{API_BASE}{path}", headers=_headers(), timeout=timeout)
-        if resp.status_code == 402:
-            return json.dumps({
-                "success": False,
-                "error": "Payment required (HTTP 402). Set RUG_MUNCH_API_KEY or use x402 payment.",
-            })
-        resp.raise_for_status()
-        return json.dumps({"success": True, **resp.json()})
+        resp = await _asend("GET", path, timeout=_timeout_for(path, timeout))
+        result = _envelope(resp, _ERR_402_GET)
+        if resp.is_success:
+            _cache_put(key, result, schema)
+        return result
     except Exception as e:
-        return json.dumps({"success": False, "error": str(e)})
+        return _dumps({"success": False, "error": str(e)})
+
+
+def _iter_sse(lines: Iterable[str]) -> Iterator[dict]:
+    """Parse a server-sent event stream, yielding each event's JSON data."""
+    data: list[str] = []
+    for line in lines:
+        if not line:
+            if data:
+                yield json.loads("\n".join(data))
+                data = []
+        elif line.startswith("data:"):
+            data.append(line[5:].removeprefix(" "))
+
+
+def _poll_token_risk(token_address: str, chain: str) -> Iterator[dict]:
+    """Poll /check-risk, yielding whenever the result changes.
+
+    The interval doubles (up to POLL_INTERVAL_MAX) while nothing changes and
+    resets to POLL_INTERVAL_MIN on a change. Bypasses the response cache.
+    """
+    body = orjson.dumps({"token_address": token_address, "chain": chain})
+    interval = POLL_INTERVAL_MIN
+    last = None
+    while True:
+        try:
+            resp = _send("POST", "/check-risk", content=body)
+            current = json.loads(_envelope(resp, _ERR_402_POST))
+        except Exception as e:
+            current = {"success": False, "error": str(e)}
+        if current != last:
+            yield current
+            last = current
+            interval = POLL_INTERVAL_MIN
+        else:
+            interval = min(POLL_INTERVAL_MAX, interval * 2)
+        time.sleep(interval)
+
+
+class _RiskBatcher:
+    """Coalesces concurrent single-token risk checks into /check-batch calls.
+
+    The first check for a chain opens a BATCH_WINDOW; every check for that
+    chain arriving before it closes (up to BATCH_MAX tokens) shares one
+    request. A window with fewer than BATCH_MIN distinct tokens is cheaper as
+    individual /check-risk calls, which are sent concurrently instead.
+    """
+
+    def __init__(self):
+        self._pending: dict[str, list[tuple[str, asyncio.Future]]] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def check(self, token_address: str, chain: str) -> str:
+        future = asyncio.get_running_loop().create_future()
+        batch = self._pending.setdefault(chain, [])
+        batch.append((token_address, future))
+        if len(batch) >= BATCH_MAX:
+            del self._pending[chain]
+            self._spawn(self._dispatch(chain, batch))
+        elif len(batch) == 1:
+            self._spawn(self._flush_later(chain, batch))
+        return await future
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush_later(self, chain: str, batch: list) -> None:
+        await asyncio.sleep(BATCH_WINDOW)
+        # The batch may already have been sent early because it filled up.
+        if self._pending.get(chain) is batch:
+            del self._pending[chain]
+            await self._dispatch(chain, batch)
+
+    async def _dispatch(self, chain: str, batch: list[tuple[str, asyncio.Future]]) -> None:
+        try:
+            tokens = list(dict.fromkeys(token for token, _ in batch))
+            if len(tokens) >= BATCH_MIN:
+                results = await self._check_batch(tokens, chain)
+            else:
+                results = await self._check_each(tokens, chain)
+            for token, future in batch:
+                if not future.done():
+                    future.set_result(results[token])
+        except Exception as e:
+            error = _dumps({"success": False, "error": str(e)})
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(error)
+
+    async def _check_batch(self, tokens: list[str], chain: str) -> dict[str, str]:
+        body = json.loads(await _apost(
+            "/check-batch", {"tokens": tokens, "chain": chain}, schema=CheckBatchSchema,
+        ))
+        if not body.get("success"):
+            return {token: _dumps(body) for token in tokens}
+
+        results = {}
+        for entry in body.get("results", []):
+            token = entry.get("token_address")
+            if token in tokens and token not in results:
+                result = _dumps({"success": True, **entry})
+                # Same bytes CheckRiskSchema.model_dump_json() produces for this token.
+                risk_body = orjson.dumps({"token_address": token, "chain": chain})
+                _cache_put(_cache_key("/check-risk", risk_body, CheckRiskSchema), result, CheckRiskSchema)
+                results[token] = result
+        # Anything the batch response did not cover is checked on its own.
+        results.update(await self._check_each([token for token in tokens if token not in results], chain))
+        return results
+
+    async def _check_each(self, tokens: list[str], chain: str) -> dict[str, str]:
+        singles = await asyncio.gather(*[
+            _apost("/check-risk", {"token_address": token, "chain": chain}, schema=CheckRiskSchema)
+            for token in tokens
+        ])
+        return dict(zip(tokens, singles))
+
+
+_BATCHERS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _RiskBatcher] = weakref.WeakKeyDictionary()
+
+
+def _risk_batcher() -> _RiskBatcher:
+    """Return the batcher for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _ASYNC_LOCK:
+        batcher = _BATCHERS.get(loop)
+        if batcher is None:
+            batcher = _BATCHERS[loop] = _RiskBatcher()
+    return batcher
 
 
 class RugMunchActionProvider(ActionProvider[WalletProvider]):
@@ -113,28 +974,48 @@ Example output:
         schema=CheckRiskSchema,
     )
     def check_token_risk(self, args: dict[str, Any]) -> str:
-        validated = CheckRiskSchema(**args)
-        return _post("/check-risk", {
-            "token_address": validated.token_address,
-            "chain": validated.chain,
-        })
+        validated = CheckRiskSchema.model_validate(args)
+        return _post_raw("/check-risk", validated.model_dump_json().encode(), schema=CheckRiskSchema)
 
     @create_action(
         name="check_batch_risk",
-        description="""Batch risk check for up to 20 tokens at once.
+        description="""Batch risk check for many tokens at once.
 Use for portfolio screening or evaluating multiple tokens.
-Cost: $0.30 (~$0.015 per token).
+Tokens are checked in concurrent batches of 20.
+Cost: $0.30 per batch of 20 (~$0.015 per token).
 
 Inputs:
-- tokens: List of token addresses (max 20)
+- tokens: List of token addresses
 - chain: Blockchain (defaults to solana)""",
         schema=CheckBatchSchema,
     )
     def check_batch_risk(self, args: dict[str, Any]) -> str:
-        validated = CheckBatchSchema(**args)
-        return _post("/check-batch", {
-            "tokens": validated.tokens[:20],
+        validated = CheckBatchSchema.model_validate(args)
+        tokens = validated.tokens
+        chunks = [tokens[i:i + BATCH_MAX] for i in range(0, len(tokens), BATCH_MAX)]
+        if len(chunks) <= 1:
+            return _post("/check-batch", {"tokens": tokens, "chain": validated.chain}, schema=CheckBatchSchema)
+
+        with ThreadPoolExecutor(max_workers=min(8, len(chunks))) as pool:
+            settled = list(pool.map(
+                lambda chunk: _post(
+                    "/check-batch", {"tokens": chunk, "chain": validated.chain}, schema=CheckBatchSchema,
+                ),
+                chunks,
+            ))
+        # A failed chunk is reported alongside the others rather than failing the whole call.
+        results, errors = [], []
+        for chunk, outcome in zip(chunks, settled):
+            body = json.loads(outcome)
+            if body.get("success"):
+                results.extend(body.get("results", []))
+            else:
+                errors.append({"tokens": chunk, "error": body.get("error")})
+        return _dumps({
+            "success": len(errors) < len(chunks),
             "chain": validated.chain,
+            "results": results,
+            "errors": errors,
         })
 
     @create_action(
@@ -149,8 +1030,8 @@ Inputs:
         schema=DeployerCheckSchema,
     )
     def check_deployer_history(self, args: dict[str, Any]) -> str:
-        validated = DeployerCheckSchema(**args)
-        return _get(f"/deployer/{validated.deployer_address}")
+        validated = DeployerCheckSchema.model_validate(args)
+        return _get(f"/deployer/{validated.deployer_address}", schema=DeployerCheckSchema)
 
     @create_action(
         name="get_holder_deepdive",
@@ -163,8 +1044,8 @@ Inputs:
         schema=TokenAddressSchema,
     )
     def get_holder_deepdive(self, args: dict[str, Any]) -> str:
-        validated = TokenAddressSchema(**args)
-        return _get(f"/holder-deepdive/{validated.token_address}")
+        validated = TokenAddressSchema.model_validate(args)
+        return _get(f"/holder-deepdive/{validated.token_address}", schema=TokenAddressSchema)
 
     @create_action(
         name="get_token_intelligence",
@@ -176,8 +1057,8 @@ Inputs:
         schema=TokenAddressSchema,
     )
     def get_token_intelligence(self, args: dict[str, Any]) -> str:
-        validated = TokenAddressSchema(**args)
-        return _get(f"/token-intel/{validated.token_address}")
+        validated = TokenAddressSchema.model_validate(args)
+        return _get(f"/token-intel/{validated.token_address}", schema=TokenAddressSchema)
 
     @create_action(
         name="marcus_quick_analysis",
@@ -192,11 +1073,27 @@ Inputs:
         schema=MarcusQuickSchema,
     )
     def marcus_quick_analysis(self, args: dict[str, Any]) -> str:
-        validated = MarcusQuickSchema(**args)
+        validated = MarcusQuickSchema.model_validate(args)
+        cached, prior = _marcus_lookup(validated.token_address, validated.chain, validated.question)
+        if cached is not None:
+            return cached
         payload = {"token_address": validated.token_address, "chain": validated.chain}
         if validated.question:
             payload["question"] = validated.question
-        return _post("/marcus-quick", payload, timeout=60)
+        result = None
+        if prior is not None:
+            # The prior verdict is response data, so it is encoded with _dumps.
+            result = _post_raw(
+                "/marcus-quick?mode=delta",
+                _dumps({**payload, "prior_verdict": prior}).encode(),
+                schema=MarcusQuickSchema,
+            )
+            if not json.loads(result)["success"]:
+                result = None
+        if result is None:
+            result = _post("/marcus-quick", payload, schema=MarcusQuickSchema)
+        _marcus_remember(validated.token_address, validated.chain, validated.question, result)
+        return result
 
     @create_action(
         name="watch_token_risk",
@@ -211,18 +1108,148 @@ Inputs:
         schema=WatchTokenSchema,
     )
     def watch_token_risk(self, args: dict[str, Any]) -> str:
-        validated = WatchTokenSchema(**args)
-        return _post("/watch", {
-            "token_address": validated.token_address,
-            "webhook_url": validated.webhook_url,
-            "watch_type": validated.watch_type,
+        validated = WatchTokenSchema.model_validate(args)
+        return _post_raw("/watch", validated.model_dump_json().encode(), schema=WatchTokenSchema)
+
+    def watch_token_stream(self, token_address: str, chain: str = "solana") -> Iterator[dict]:
+        """Yield risk events for a token as they happen.
+
+        Not an AgentKit action (actions return a single string); iterate it from
+        agent code instead of polling check_token_risk in a loop. Events are read
+        from the /watch/stream server-sent event endpoint over one long-lived
+        connection, reconnecting with exponential backoff that resets on every
+        event. If the API has no stream endpoint, falls back to polling
+        /check-risk with an adaptive interval.
+        """
+        interval = 1.0
+        while True:
+            try:
+                _BUCKET.acquire()
+                with _client().stream(
+                    "GET",
+                    _url(f"/watch/stream/{token_address}"),
+                    params={"chain": chain},
+                    headers={"Accept": "text/event-stream"},
+                    timeout=httpx.Timeout(30, connect=DEFAULT_TIMEOUT[0], read=90),
+                ) as resp:
+                    if resp.status_code in (404, 405, 501):
+                        break
+                    if resp.status_code == 402:
+                        yield json.loads(_ERR_402_GET)
+                        return
+                    resp.raise_for_status()
+                    for event in _iter_sse(resp.iter_lines()):
+                        interval = 1.0
+                        yield event
+            except httpx.HTTPStatusError as e:
+                # Client errors will not fix themselves; 429 and 5xx are retried.
+                if e.response.status_code < 500 and e.response.status_code != 429:
+                    yield {"success": False, "error": str(e)}
+                    return
+            except (httpx.TransportError, json.JSONDecodeError):
+                pass
+            time.sleep(interval)
+            interval = min(STREAM_BACKOFF_MAX, interval * 2)
+        yield from _poll_token_risk(token_address, chain)
+
+    # Async variants. These are not registered as AgentKit actions (actions
+    # must return synchronously); call them directly from async agent code.
+
+    async def acheck_token_risk(self, args: dict[str, Any]) -> str:
+        """Async version of check_token_risk.
+
+        Concurrent calls are coalesced into /check-batch requests; see _RiskBatcher.
+        """
+        validated = CheckRiskSchema.model_validate(args)
+        body = validated.model_dump_json().encode()
+        if BATCH_WINDOW <= 0:
+            return await _apost_raw("/check-risk", body, schema=CheckRiskSchema)
+        cached = _cache_get(_cache_key("/check-risk", body, CheckRiskSchema))
+        if cached is not None:
+            return cached
+        return await _risk_batcher().check(validated.token_address, validated.chain)
+
+    async def acheck_batch_risk(self, args: dict[str, Any]) -> str:
+        """Async batch risk check: one concurrent acheck_token_risk per token.
+
+        The per-token checks are coalesced back into /check-batch requests
+        wherever a batch is cheaper than the individual checks.
+        """
+        validated = CheckBatchSchema.model_validate(args)
+        tokens = validated.tokens
+        settled = await asyncio.gather(
+            *[
+                self.acheck_token_risk({"token_address": t, "chain": validated.chain})
+                for t in tokens
+            ],
+            return_exceptions=True,
+        )
+        results = []
+        for token, outcome in zip(tokens, settled):
+            if isinstance(outcome, BaseException):
+                results.append({"success": False, "token_address": token, "error": str(outcome)})
+            else:
+                results.append({"token_address": token, **json.loads(outcome)})
+        return _dumps({
+            "success": any(r["success"] for r in results),
+            "chain": validated.chain,
+            "results": results,
         })
 
+    async def acheck_deployer_history(self, args: dict[str, Any]) -> str:
+        """Async version of check_deployer_history."""
+        validated = DeployerCheckSchema.model_validate(args)
+        return await _aget(f"/deployer/{validated.deployer_address}", schema=DeployerCheckSchema)
+
+    async def aget_holder_deepdive(self, args: dict[str, Any]) -> str:
+        """Async version of get_holder_deepdive."""
+        validated = TokenAddressSchema.model_validate(args)
+        return await _aget(f"/holder-deepdive/{validated.token_address}", schema=TokenAddressSchema)
+
+    async def aget_token_intelligence(self, args: dict[str, Any]) -> str:
+        """Async version of get_token_intelligence."""
+        validated = TokenAddressSchema.model_validate(args)
+        return await _aget(f"/token-intel/{validated.token_address}", schema=TokenAddressSchema)
+
+    async def amarcus_quick_analysis(self, args: dict[str, Any]) -> str:
+        """Async version of marcus_quick_analysis."""
+        validated = MarcusQuickSchema.model_validate(args)
+        cached, prior = _marcus_lookup(validated.token_address, validated.chain, validated.question)
+        if cached is not None:
+            return cached
+        payload = {"token_address": validated.token_address, "chain": validated.chain}
+        if validated.question:
+            payload["question"] = validated.question
+        result = None
+        if prior is not None:
+            # The prior verdict is response data, so it is encoded with _dumps.
+            result = await _apost_raw(
+                "/marcus-quick?mode=delta",
+                _dumps({**payload, "prior_verdict": prior}).encode(),
+                schema=MarcusQuickSchema,
+            )
+            if not json.loads(result)["success"]:
+                result = None
+        if result is None:
+            result = await _apost("/marcus-quick", payload, schema=MarcusQuickSchema)
+        _marcus_remember(validated.token_address, validated.chain, validated.question, result)
+        return result
+
+    async def awatch_token_risk(self, args: dict[str, Any]) -> str:
+        """Async version of watch_token_risk."""
+        validated = WatchTokenSchema.model_validate(args)
+        return await _apost_raw("/watch", validated.model_dump_json().encode(), schema=WatchTokenSchema)
+
     def supports_network(self, network: "Network") -> bool:
         """Rug Munch works on any network (Solana, Base, Ethereum, etc.)."""
         return True
 
 
+@functools.lru_cache(maxsize=1)
 def rug_munch_action_provider() -> RugMunchActionProvider:
-    """Create a Rug Munch Intelligence action provider instance."""
+    """Return the process-wide Rug Munch Intelligence action provider.
+
+    The provider holds no per-instance state, so every AgentKit configuration
+    shares one instance and action discovery runs once per process.
+    """
     return RugMunchActionProvider()
@@ -1,32 +1,53 @@
-"""Input schemas for Rug Munch actions."""
+"""Input schemas for Rug Munch actions.
+
+Each schema also carries the client-side cache policy for its action:
+``cacheable`` marks deterministic lookups whose responses may be reused, and
+``cache_ttl`` is how long (seconds) a reused response stays valid.
+"""
+
+from typing import ClassVar
 
 from pydantic import BaseModel, Field
 
 
 class CheckRiskSchema(BaseModel):
     """Schema for check_token_risk action."""
+    cacheable: ClassVar[bool] = True
+    cache_ttl: ClassVar[int] = 60
     token_address: str = Field(..., description="Token mint (Solana) or contract address (EVM)")
     chain: str = Field(default="solana", description="Blockchain: solana, ethereum, base, arbitrum, polygon")
 
 
 class CheckBatchSchema(BaseModel):
     """Schema for batch risk check."""
-    tokens: list[str] = Field(..., description="List of token addresses (max 20)")
+    cacheable: ClassVar[bool] = False
+    cache_ttl: ClassVar[int] = 0
+    tokens: list[str] = Field(..., description="List of token addresses, checked in batches of 20")
     chain: str = Field(default="solana")
 
 
 class DeployerCheckSchema(BaseModel):
     """Schema for deployer history check."""
+    cacheable: ClassVar[bool] = True
+    cache_ttl: ClassVar[int] = 300
     deployer_address: str = Field(..., description="Deployer wallet address")
 
 
 class TokenAddressSchema(BaseModel):
     """Generic schema for single token address."""
+    cacheable: ClassVar[bool] = True
+    cache_ttl: ClassVar[int] = 60
     token_address: str = Field(..., description="Token address")
 
 
 class MarcusQuickSchema(BaseModel):
-    """Schema for Marcus AI quick analysis."""
+    """Schema for Marcus AI quick analysis.
+
+    LLM output is never response-cached; cache_ttl is how long a verdict is kept
+    for exact repeat questions and delta follow-ups.
+    """
+    cacheable: ClassVar[bool] = False
+    cache_ttl: ClassVar[int] = 300
     token_address: str = Field(..., description="Token address")
     chain: str = Field(default="solana")
     question: str = Field(default=None, description="Optional specific question about the token")
@@ -34,6 +55,8 @@ class MarcusQuickSchema(BaseModel):
 
 class WatchTokenSchema(BaseModel):
     """Schema for token watch setup."""
+    cacheable: ClassVar[bool] = False
+    cache_ttl: ClassVar[int] = 0
     token_address: str = Field(..., description="Token to monitor")
     webhook_url: str = Field(..., description="HTTPS URL to POST alerts to")
     watch_type: str = Field(default="rug_detected", description="risk_change, rug_detected, price_drop, all")
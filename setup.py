@@ -12,9 +12,15 @@ setup(
     packages=find_packages(),
     install_requires=[
         "coinbase-agentkit>=0.2.0",
-        "requests>=2.31.0",
+        "httpx[http2]>=0.25.0",
         "pydantic>=2.0.0",
+        "cachetools>=5.0.0",
+        "orjson>=3.9.0",
     ],
+    extras_require={
+        "uvloop": ["uvloop>=0.17.0"],
+        "test": ["pytest>=7.0"],
+    },
     python_requires=">=3.10",
     license="MIT",
     classifiers=[
@@ -0,0 +1,103 @@
+"""Shared fixtures: a mock Rug Munch API behind httpx.MockTransport."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from coinbase_agentkit.action_providers import action_decorator
+
+from rug_munch_agentkit import action_provider
+
+API_PATH = httpx.URL(action_provider.API_BASE).path.rstrip("/")
+
+
+class MockAPI:
+    """Records requests and answers them roughly like the Rug Munch API."""
+
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+        # Tokens /check-batch leaves out of its results.
+        self.batch_omits: set[str] = set()
+        # Responses for paths that should not get the default answer. A list is
+        # answered in order, repeating its last response; a callable is called
+        # with the request.
+        self.responses: dict[str, Any] = {}
+
+    @property
+    def paths(self) -> list[str]:
+        return [request.url.path.removeprefix(API_PATH) for request in self.requests]
+
+    def bodies(self, path: str) -> list[dict]:
+        return [
+            json.loads(request.content)
+            for request in self.requests
+            if request.url.path.removeprefix(API_PATH) == path
+        ]
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path.removeprefix(API_PATH)
+        if path in self.responses:
+            response = self.responses[path]
+            if isinstance(response, list):
+                return response.pop(0) if len(response) > 1 else response[0]
+            if callable(response):
+                return response(request)
+            return response
+        if path == "/check-batch":
+            tokens = json.loads(request.content)["tokens"]
+            return httpx.Response(200, json={"results": [
+                {"token_address": token, "risk_score": 10}
+                for token in tokens
+                if token not in self.batch_omits
+            ]})
+        if path == "/check-risk":
+            token = json.loads(request.content)["token_address"]
+            return httpx.Response(200, json={"token_address": token, "risk_score": 20})
+        return httpx.Response(200, json={"path": path})
+
+
+@pytest.fixture
+def api(monkeypatch: pytest.MonkeyPatch) -> MockAPI:
+    """Route both clients to a MockAPI, with caching, rate limiting and AgentKit analytics off."""
+    mock = MockAPI()
+    transport = httpx.MockTransport(mock.handler)
+
+    async def async_client() -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=transport)
+
+    monkeypatch.setattr(action_provider, "_CLIENT", httpx.Client(transport=transport))
+    monkeypatch.setattr(action_provider, "_async_client", async_client)
+    monkeypatch.setattr(action_provider, "_CACHE", None)
+    monkeypatch.setattr(action_provider, "_BUCKET", action_provider._TokenBucket(0))
+    monkeypatch.setattr(action_decorator, "send_analytics_event", lambda event: None)
+    return mock
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """A local HTTP server on 127.0.0.1 that echoes each request's target."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_port
+    httpd.shutdown()
+    httpd.server_close()
@@ -0,0 +1,146 @@
+"""Batch risk checks: check_batch_risk chunking and coalescing of acheck_token_risk (_RiskBatcher)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import httpx
+
+from rug_munch_agentkit import RugMunchActionProvider, action_provider
+
+
+def check_all(tokens: list[str], chain: str = "solana") -> list[dict]:
+    provider = RugMunchActionProvider()
+
+    async def run():
+        return await asyncio.gather(*[
+            provider.acheck_token_risk({"token_address": token, "chain": chain})
+            for token in tokens
+        ])
+
+    return [json.loads(result) for result in asyncio.run(run())]
+
+
+def test_small_window_sends_individual_checks(api):
+    results = check_all(["A", "B", "C"])
+
+    assert sorted(api.paths) == ["/check-risk"] * 3
+    assert [r["token_address"] for r in results] == ["A", "B", "C"]
+    assert all(r["success"] for r in results)
+
+
+def test_break_even_window_sends_one_batch(api):
+    tokens = [f"T{i}" for i in range(action_provider.BATCH_MIN)]
+    results = check_all(tokens)
+
+    assert api.paths == ["/check-batch"]
+    assert api.bodies("/check-batch") == [{"tokens": tokens, "chain": "solana"}]
+    assert [r["token_address"] for r in results] == tokens
+    assert all(r["success"] and r["risk_score"] == 10 for r in results)
+
+
+def test_batch_min_is_configurable(api, monkeypatch):
+    monkeypatch.setattr(action_provider, "BATCH_MIN", 2)
+    check_all(["A", "B"])
+
+    assert api.paths == ["/check-batch"]
+
+
+def test_duplicate_tokens_are_checked_once(api):
+    tokens = [f"T{i}" for i in range(action_provider.BATCH_MIN)]
+    results = check_all(tokens + tokens[:3])
+
+    assert api.bodies("/check-batch") == [{"tokens": tokens, "chain": "solana"}]
+    assert results[-3:] == results[:3]
+
+
+def test_duplicates_do_not_count_towards_break_even(api):
+    check_all(["A", "B"] * action_provider.BATCH_MIN)
+
+    assert sorted(api.paths) == ["/check-risk"] * 2
+
+
+def test_full_batch_is_sent_before_window_closes(api, monkeypatch):
+    monkeypatch.setattr(action_provider, "BATCH_WINDOW", 30)
+    started = time.monotonic()
+    check_all([f"T{i}" for i in range(action_provider.BATCH_MAX)])
+
+    assert time.monotonic() - started < 5
+    assert api.paths == ["/check-batch"]
+
+
+def test_chains_are_batched_separately(api):
+    provider = RugMunchActionProvider()
+    tokens = [f"T{i}" for i in range(action_provider.BATCH_MIN)]
+
+    async def run():
+        return await asyncio.gather(*[
+            provider.acheck_token_risk({"token_address": token, "chain": chain})
+            for chain in ("solana", "base")
+            for token in tokens
+        ])
+
+    asyncio.run(run())
+
+    assert sorted(body["chain"] for body in api.bodies("/check-batch")) == ["base", "solana"]
+
+
+def test_tokens_missing_from_batch_fall_back_to_single_checks(api):
+    tokens = [f"T{i}" for i in range(action_provider.BATCH_MIN)]
+    api.batch_omits = {"T3"}
+    results = check_all(tokens)
+
+    assert sorted(api.paths) == ["/check-batch", "/check-risk"]
+    assert api.bodies("/check-risk") == [{"token_address": "T3", "chain": "solana"}]
+    assert results[3]["risk_score"] == 20
+    assert all(r["success"] for r in results)
+
+
+def test_failed_batch_is_reported_to_every_caller(api):
+    api.responses["/check-batch"] = httpx.Response(500, json={"detail": "boom"})
+    results = check_all([f"T{i}" for i in range(action_provider.BATCH_MIN)])
+
+    assert api.paths == ["/check-batch"]
+    assert all(not r["success"] and "500" in r["error"] for r in results)
+
+
+def test_zero_window_disables_coalescing(api, monkeypatch):
+    monkeypatch.setattr(action_provider, "BATCH_WINDOW", 0)
+    check_all([f"T{i}" for i in range(action_provider.BATCH_MIN)])
+
+    assert api.paths == ["/check-risk"] * action_provider.BATCH_MIN
+
+
+def test_large_batches_are_split_into_chunks(api):
+    def check_batch(request):
+        tokens = json.loads(request.content)["tokens"]
+        if tokens[0] == "T20":
+            return httpx.Response(500, json={"detail": "boom"})
+        if tokens[0] == "T40":
+            return httpx.Response(200, content=b'{"results": [', headers={"Content-Type": "application/json"})
+        return httpx.Response(200, json={"results": [{"token_address": t, "risk_score": 10} for t in tokens]})
+
+    api.responses["/check-batch"] = check_batch
+    tokens = [f"T{i}" for i in range(45)]
+
+    result = json.loads(RugMunchActionProvider().check_batch_risk({"tokens": tokens, "chain": "base"}))
+
+    assert sorted(len(body["tokens"]) for body in api.bodies("/check-batch")) == [5, 20, 20]
+    assert result["success"] and result["chain"] == "base"
+    assert [r["token_address"] for r in result["results"]] == tokens[:20]
+    assert [e["tokens"] for e in result["errors"]] == [tokens[20:40], tokens[40:]]
+    assert "500" in result["errors"][0]["error"]
+    assert result["errors"][1]["error"]
+
+
+def test_large_batch_fails_when_every_chunk_fails(api):
+    api.responses["/check-batch"] = httpx.Response(500, json={"detail": "boom"})
+    tokens = [f"T{i}" for i in range(25)]
+
+    result = json.loads(RugMunchActionProvider().check_batch_risk({"tokens": tokens}))
+
+    assert not result["success"]
+    assert result["results"] == []
+    assert [e["tokens"] for e in result["errors"]] == [tokens[:20], tokens[20:]]
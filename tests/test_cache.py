@@ -0,0 +1,80 @@
+"""Client-side response cache."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from rug_munch_agentkit import RugMunchActionProvider, action_provider
+
+
+@pytest.fixture
+def cache(api, monkeypatch):
+    monkeypatch.setattr(action_provider, "_CACHE", action_provider._make_cache())
+    return api
+
+
+@pytest.mark.parametrize("action, args", [
+    ("acheck_deployer_history", {"deployer_address": "D"}),
+    ("aget_holder_deepdive", {"token_address": "T"}),
+    ("aget_token_intelligence", {"token_address": "T"}),
+])
+def test_async_lookups_are_cached(cache, action, args):
+    method = getattr(RugMunchActionProvider(), action)
+
+    async def run():
+        return await method(args), await method(args)
+
+    first, second = asyncio.run(run())
+
+    assert first == second
+    assert len(cache.requests) == 1
+
+
+def test_async_watch_is_not_cached(cache):
+    provider = RugMunchActionProvider()
+    args = {"token_address": "T", "webhook_url": "https://example.com/hook"}
+
+    async def run():
+        await provider.awatch_token_risk(args)
+        await provider.awatch_token_risk(args)
+
+    asyncio.run(run())
+
+    assert cache.paths == ["/watch", "/watch"]
+
+
+def test_replay_survives_restarts_and_eviction(api, monkeypatch, tmp_path):
+    provider = RugMunchActionProvider()
+    tokens = [{"token_address": f"T{i}"} for i in range(3)]
+
+    async def run():
+        return [await provider.aget_token_intelligence(args) for args in tokens]
+
+    monkeypatch.setattr(action_provider, "_CACHE", action_provider._ReplayCache(str(tmp_path)))
+    recorded = asyncio.run(run())
+    assert len(api.requests) == 3
+
+    # A fresh process, with room for only one entry in memory.
+    monkeypatch.setattr(action_provider, "_CACHE", action_provider._ReplayCache(str(tmp_path), maxsize=1))
+    assert asyncio.run(run()) == recorded
+    assert asyncio.run(run()) == recorded
+    assert len(api.requests) == 3
+    assert len(list(tmp_path.glob("*.json"))) == 3
+
+
+def test_replay_does_not_record_failures(api, monkeypatch, tmp_path):
+    api.responses["/token-intel/T"] = httpx.Response(500)
+    monkeypatch.setattr(action_provider, "_CACHE", action_provider._ReplayCache(str(tmp_path)))
+    provider = RugMunchActionProvider()
+
+    async def run():
+        await provider.aget_token_intelligence({"token_address": "T"})
+        await provider.aget_token_intelligence({"token_address": "T"})
+
+    asyncio.run(run())
+
+    assert len(api.requests) == 2
+    assert not list(tmp_path.iterdir())
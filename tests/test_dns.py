@@ -0,0 +1,99 @@
+"""Process-wide DNS cache wired into the httpx transports."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import socket
+
+import httpcore
+import httpx
+import pytest
+
+from rug_munch_agentkit import action_provider
+
+HOST = "api.rugmunch.test"
+
+
+@pytest.fixture
+def dual_stack(server, monkeypatch):
+    """Resolve HOST to an unreachable ::1 first, then the IPv4 server."""
+    lookups = []
+    real_getaddrinfo = socket.getaddrinfo
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        if host != HOST:
+            return real_getaddrinfo(host, port, *args, **kwargs)
+        lookups.append(host)
+        return [
+            (socket.AF_INET6, socket.SOCK_STREAM, 6, "", ("::1", port, 0, 0)),
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("127.0.0.1", port)),
+        ]
+
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+    monkeypatch.setattr(action_provider, "API_BASE", f"http://{HOST}:{server}/api/agent/v1")
+    monkeypatch.setattr(action_provider, "_DNS", action_provider._DNSCache(60))
+    monkeypatch.setattr(action_provider, "_BUCKET", action_provider._TokenBucket(0))
+    action_provider._url.cache_clear()
+    yield lookups
+    action_provider._url.cache_clear()
+
+
+def test_wraps_the_network_backend_of_the_installed_httpcore():
+    transport = httpx.HTTPTransport()
+    action_provider._use_dns_cache(transport, action_provider._CachedDNSBackend)
+    assert isinstance(transport._pool._network_backend, action_provider._CachedDNSBackend)
+
+    transport = httpx.AsyncHTTPTransport()
+    action_provider._use_dns_cache(transport, action_provider._AsyncCachedDNSBackend)
+    assert isinstance(transport._pool._network_backend, action_provider._AsyncCachedDNSBackend)
+
+
+def test_skipped_on_untested_httpcore_versions(monkeypatch):
+    monkeypatch.setattr(httpcore, "__version__", "2.0.0")
+    transport = httpx.HTTPTransport()
+    backend = transport._pool._network_backend
+    action_provider._use_dns_cache(transport, action_provider._CachedDNSBackend)
+
+    assert transport._pool._network_backend is backend
+
+
+def test_falls_through_to_a_reachable_address(dual_stack, monkeypatch):
+    monkeypatch.setattr(action_provider, "_CLIENT", action_provider._make_client())
+    for i in range(3):
+        result = json.loads(action_provider._get(f"/x{i}", timeout=(1, 5)))
+        assert result["success"], result
+
+    assert dual_stack == [HOST]
+    port = httpx.URL(action_provider.API_BASE).port
+    assert action_provider._DNS.resolve(HOST, port) == ["127.0.0.1", "::1"]
+
+
+def test_async_falls_through_to_a_reachable_address(dual_stack):
+    async def run():
+        try:
+            return json.loads(await action_provider._aget("/x", timeout=(1, 5)))
+        finally:
+            await (await action_provider._async_client()).aclose()
+
+    # A plain asyncio loop: uvloop resolves through libuv, not socket.getaddrinfo.
+    loop = asyncio.SelectorEventLoop()
+    try:
+        result = loop.run_until_complete(run())
+    finally:
+        loop.close()
+
+    assert result["success"], result
+    assert dual_stack == [HOST]
+
+
+def test_unreachable_addresses_are_re_resolved(dual_stack, monkeypatch):
+    monkeypatch.setattr(action_provider, "API_BASE", f"http://{HOST}:1/api/agent/v1")
+    action_provider._url.cache_clear()
+    monkeypatch.setattr(action_provider, "_CLIENT", action_provider._make_client())
+
+    for _ in range(2):
+        assert not json.loads(action_provider._get("/x", timeout=(1, 5)))["success"]
+
+    # Each attempt (including the transport's own connect retries) re-resolves.
+    assert len(dual_stack) > 2
@@ -0,0 +1,66 @@
+"""Proxy environment variables for the shared clients."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from rug_munch_agentkit import action_provider
+
+UPSTREAM = "http://upstream.rugmunch.test/api/agent/v1"
+
+
+@pytest.fixture
+def environ(monkeypatch):
+    """Start without proxy variables and point the API at an unresolvable host."""
+    for name in ("http_proxy", "https_proxy", "all_proxy", "no_proxy"):
+        monkeypatch.delenv(name, raising=False)
+        monkeypatch.delenv(name.upper(), raising=False)
+    monkeypatch.setattr(action_provider, "API_BASE", UPSTREAM)
+    monkeypatch.setattr(action_provider, "_BUCKET", action_provider._TokenBucket(0))
+    action_provider._url.cache_clear()
+    yield monkeypatch
+    action_provider._url.cache_clear()
+
+
+def test_no_proxy_configured(environ):
+    assert action_provider._proxy_mounts(httpx.HTTPTransport) == {}
+
+
+def test_requests_go_through_the_proxy(environ, server):
+    environ.setenv("HTTP_PROXY", f"http://127.0.0.1:{server}")
+    environ.setattr(action_provider, "_CLIENT", action_provider._make_client())
+
+    result = json.loads(action_provider._get("/deployer/D", timeout=(1, 5)))
+
+    assert result == {"success": True, "path": UPSTREAM + "/deployer/D"}
+
+
+def test_async_requests_go_through_the_proxy(environ, server):
+    environ.setenv("HTTP_PROXY", f"http://127.0.0.1:{server}")
+
+    async def run():
+        try:
+            return json.loads(await action_provider._aget("/deployer/D", timeout=(1, 5)))
+        finally:
+            await (await action_provider._async_client()).aclose()
+
+    assert asyncio.run(run()) == {"success": True, "path": UPSTREAM + "/deployer/D"}
+
+
+def test_all_proxy_and_missing_scheme(environ):
+    environ.setenv("ALL_PROXY", "proxy.local:3128")
+    mounts = action_provider._proxy_mounts(httpx.HTTPTransport)
+
+    assert list(mounts) == ["http://"]
+    assert mounts["http://"]._pool._proxy_url.host == b"proxy.local"
+
+
+def test_no_proxy_bypasses_the_proxy(environ):
+    environ.setenv("HTTP_PROXY", "http://proxy.local:3128")
+    environ.setenv("NO_PROXY", "localhost,.rugmunch.test")
+
+    assert action_provider._proxy_mounts(httpx.HTTPTransport) == {}
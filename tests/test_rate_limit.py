@@ -0,0 +1,76 @@
+"""Client-side token bucket (_TokenBucket)."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from rug_munch_agentkit.action_provider import _TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A fake time.monotonic, advanced by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_bursts_one_second_of_tokens(clock):
+    bucket = _TokenBucket(600)
+
+    assert [bucket.reserve() for _ in range(10)] == [0.0] * 10
+    assert bucket.reserve() == pytest.approx(0.1)
+
+
+def test_waits_queue_up_behind_each_other(clock):
+    bucket = _TokenBucket(60)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(1.0)
+    assert bucket.reserve() == pytest.approx(2.0)
+
+    clock[0] += 3
+    assert bucket.reserve() == 0.0
+
+
+def test_refill_is_capped_at_capacity(clock):
+    bucket = _TokenBucket(120)
+    bucket.reserve()
+    bucket.reserve()
+
+    clock[0] += 100
+    assert [bucket.reserve() for _ in range(2)] == [0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+
+
+def test_slow_rates_still_allow_one_request(clock):
+    bucket = _TokenBucket(6)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(10.0)
+
+
+def test_zero_rpm_disables_limiting(clock):
+    bucket = _TokenBucket(0)
+
+    assert [bucket.reserve() for _ in range(100)] == [0.0] * 100
+
+
+def test_acquire_sleeps_for_the_reserved_wait(clock, monkeypatch):
+    slept = []
+
+    async def asleep(delay):
+        slept.append(delay)
+
+    monkeypatch.setattr(time, "sleep", slept.append)
+    monkeypatch.setattr(asyncio, "sleep", asleep)
+    bucket = _TokenBucket(60)
+
+    bucket.acquire()
+    bucket.acquire()
+    asyncio.run(bucket.aacquire())
+
+    assert slept == [pytest.approx(1.0), pytest.approx(2.0)]
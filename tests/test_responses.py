@@ -0,0 +1,136 @@
+"""Response envelopes returned by the actions."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from rug_munch_agentkit import RugMunchActionProvider, action_provider
+
+SUPPLY = 123456789012345678901234567
+
+
+def intel_response(**extra) -> httpx.Response:
+    body = json.dumps({"token_address": "T", "supply": SUPPLY, **extra})
+    return httpx.Response(200, content=body.encode(), headers={"Content-Type": "application/json"})
+
+
+def test_large_integers_survive_the_envelope(api):
+    api.responses["/token-intel/T"] = intel_response()
+    result = asyncio.run(RugMunchActionProvider().aget_token_intelligence({"token_address": "T"}))
+
+    assert json.loads(result) == {"success": True, "token_address": "T", "supply": SUPPLY}
+    assert str(SUPPLY) in result
+
+
+def test_large_integers_survive_batch_aggregation(api, monkeypatch):
+    monkeypatch.setattr(action_provider, "BATCH_WINDOW", 0)
+    api.responses["/check-risk"] = intel_response()
+    result = asyncio.run(RugMunchActionProvider().acheck_batch_risk({"tokens": ["T"]}))
+
+    assert json.loads(result)["results"][0]["supply"] == SUPPLY
+
+
+def test_large_integers_survive_marcus_delta(api, monkeypatch):
+    monkeypatch.setattr(action_provider, "_MARCUS_VERDICTS", action_provider._make_cache(60))
+    monkeypatch.setattr(action_provider, "_MARCUS_SESSIONS", action_provider._make_cache(60))
+    api.responses["/marcus-quick"] = intel_response(verdict="AVOID")
+    provider = RugMunchActionProvider()
+
+    async def run():
+        await provider.amarcus_quick_analysis({"token_address": "T", "question": "Is it safe"})
+        return await provider.amarcus_quick_analysis({"token_address": "T", "question": "Is it safe to hold"})
+
+    asyncio.run(run())
+
+    assert api.paths == ["/marcus-quick", "/marcus-quick"]
+    assert api.requests[1].url.params["mode"] == "delta"
+    assert json.loads(api.requests[1].content)["prior_verdict"]["supply"] == SUPPLY
+
+
+def envelope(body: bytes, content_type: str = "application/json") -> str:
+    request = httpx.Request("GET", action_provider.API_BASE + "/token-intel/T")
+    resp = httpx.Response(200, content=body, headers={"Content-Type": content_type}, request=request)
+    return action_provider._envelope(resp, action_provider._ERR_402_GET)
+
+
+def test_envelope_is_the_same_for_any_size():
+    small = {"token_address": "T", "holders": [{"balance": SUPPLY}]}
+    large = {"token_address": "T", "holders": [{"balance": SUPPLY}] * 5000}
+
+    for payload in (small, large):
+        result = envelope(json.dumps(payload).encode())
+        assert result.startswith('{"success":true,')
+        assert json.loads(result) == {"success": True, **payload}
+
+
+def test_envelope_keeps_a_server_sent_success_field():
+    for payload in ({"success": False, "error": "x"}, {"success": False, "pad": "x" * 100_000}):
+        result = envelope(json.dumps(payload).encode())
+        assert result.count('"success"') == 1
+        assert json.loads(result) == payload
+
+
+def test_envelope_only_adds_success_at_the_top_level():
+    for pad in ("", "x" * 100_000):
+        result = envelope(json.dumps({"data": {"success": 1}, "pad": pad}).encode())
+        assert json.loads(result) == {"success": True, "data": {"success": 1}, "pad": pad}
+
+
+def test_envelope_of_empty_object():
+    assert json.loads(envelope(b" {  } \n")) == {"success": True}
+
+
+def test_envelope_parses_bodies_not_labelled_json():
+    assert json.loads(envelope(b'{"a": 1}', content_type="text/plain")) == {"success": True, "a": 1}
+
+
+LARGE = json.dumps({"token_address": "T", "holders": [{"balance": SUPPLY}] * 5000})
+MALFORMED = [
+    b'{"price": 1',
+    b'{"price": {"usd": 1}',
+    b'{"price": 1}}',
+    b'{"price": 1} trailing',
+    LARGE[:-1].encode(),
+    LARGE[:-2].encode() + b"}",
+    LARGE.encode() + b"}",
+    LARGE.encode() + b" trailing",
+]
+
+
+@pytest.mark.parametrize("body", MALFORMED, ids=lambda body: f"{body[:12]!r}..{body[-12:]!r}")
+def test_envelope_rejects_malformed_bodies(body):
+    with pytest.raises(ValueError):
+        envelope(body)
+
+
+@pytest.mark.parametrize("body", MALFORMED[::4], ids=["small", "large"])
+def test_malformed_bodies_are_reported_and_not_cached(api, monkeypatch, body):
+    monkeypatch.setattr(action_provider, "_CACHE", action_provider._make_cache())
+    api.responses["/token-intel/T"] = httpx.Response(
+        200, content=body, headers={"Content-Type": "application/json"},
+    )
+    provider = RugMunchActionProvider()
+
+    async def run():
+        return [await provider.aget_token_intelligence({"token_address": "T"}) for _ in range(2)]
+
+    results = [json.loads(result) for result in asyncio.run(run())]
+
+    assert all(not result["success"] for result in results)
+    assert len(api.requests) == 2
+
+
+def test_malformed_marcus_verdict_is_reported(api, monkeypatch):
+    monkeypatch.setattr(action_provider, "_MARCUS_VERDICTS", action_provider._make_cache(60))
+    monkeypatch.setattr(action_provider, "_MARCUS_SESSIONS", action_provider._make_cache(60))
+    api.responses["/marcus-quick"] = httpx.Response(
+        200, content=b'{"verdict": "AVOID"', headers={"Content-Type": "application/json"},
+    )
+
+    result = asyncio.run(RugMunchActionProvider().amarcus_quick_analysis({"token_address": "T"}))
+
+    assert not json.loads(result)["success"]
@@ -0,0 +1,96 @@
+"""Retries of transient failures (_send, _asend, _retry_delay)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from rug_munch_agentkit import action_provider
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record the delays of time.sleep and asyncio.sleep instead of waiting."""
+    delays = []
+
+    async def asleep(delay, result=None):
+        delays.append(delay)
+        return result
+
+    monkeypatch.setattr(time, "sleep", delays.append)
+    monkeypatch.setattr(asyncio, "sleep", asleep)
+    return delays
+
+
+def response(status: int, **headers) -> httpx.Response:
+    return httpx.Response(status, headers=headers, json={"status": status})
+
+
+def test_retry_after_seconds():
+    assert action_provider._retry_delay(response(429, **{"Retry-After": "7"}), 0) == 7.0
+
+
+def test_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    delay = action_provider._retry_delay(response(503, **{"Retry-After": format_datetime(when, usegmt=True)}), 0)
+
+    assert 25 < delay <= 30
+
+
+def test_retry_after_is_capped_and_never_negative():
+    past = format_datetime(datetime.now(timezone.utc) - timedelta(hours=1), usegmt=True)
+
+    assert action_provider._retry_delay(response(429, **{"Retry-After": "3600"}), 0) == action_provider.BACKOFF_MAX
+    assert action_provider._retry_delay(response(429, **{"Retry-After": past}), 0) == 0.0
+
+
+@pytest.mark.parametrize("retry_after", [None, "soon"])
+def test_backoff_without_usable_retry_after(retry_after):
+    headers = {"Retry-After": retry_after} if retry_after else {}
+    for attempt in range(3):
+        base = action_provider.BACKOFF_FACTOR * 2 ** attempt
+        assert base <= action_provider._retry_delay(response(503, **headers), attempt) <= base + 0.25
+
+
+def test_transient_failures_are_retried(api, sleeps):
+    api.responses["/deployer/D"] = [response(503), response(429, **{"Retry-After": "2"}), response(200)]
+
+    result = json.loads(action_provider._get("/deployer/D"))
+
+    assert result == {"success": True, "status": 200}
+    assert len(api.requests) == 3
+    assert sleeps[1] == 2.0
+
+
+def test_gives_up_after_max_retries(api, sleeps):
+    api.responses["/deployer/D"] = response(503)
+
+    result = json.loads(action_provider._get("/deployer/D"))
+
+    assert not result["success"] and "503" in result["error"]
+    assert len(api.requests) == action_provider.MAX_RETRIES + 1
+    assert len(sleeps) == action_provider.MAX_RETRIES
+
+
+def test_other_errors_are_not_retried(api, sleeps):
+    api.responses["/deployer/D"] = response(500)
+
+    assert not json.loads(action_provider._get("/deployer/D"))["success"]
+    assert len(api.requests) == 1
+    assert sleeps == []
+
+
+def test_async_transient_failures_are_retried(api, sleeps):
+    api.responses["/deployer/D"] = [response(502), response(504), response(503), response(503)]
+
+    result = json.loads(asyncio.run(action_provider._aget("/deployer/D")))
+
+    assert not result["success"]
+    assert len(api.requests) == action_provider.MAX_RETRIES + 1
+    assert len(sleeps) == action_provider.MAX_RETRIES
@@ -0,0 +1,97 @@
+"""watch_token_stream: server-sent events, reconnects and the polling fallback."""
+
+from __future__ import annotations
+
+import itertools
+import time
+
+import httpx
+import pytest
+
+from rug_munch_agentkit import RugMunchActionProvider, action_provider
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(time, "sleep", delays.append)
+    return delays
+
+
+def events(*payloads: bytes) -> httpx.Response:
+    return httpx.Response(200, content=b"".join(payloads), headers={"Content-Type": "text/event-stream"})
+
+
+def watch(count: int | None = None) -> list[dict]:
+    stream = RugMunchActionProvider().watch_token_stream("T", chain="base")
+    return list(itertools.islice(stream, count))
+
+
+def test_iter_sse_joins_multi_line_data():
+    lines = [
+        ": keep-alive",
+        "event: risk",
+        'data: {"risk_score":',
+        "data:  80}",
+        "",
+        "",
+        'data:{"risk_score": 90}',
+        "id: 2",
+        "",
+        'data: {"unterminated": true}',
+    ]
+
+    assert list(action_provider._iter_sse(lines)) == [{"risk_score": 80}, {"risk_score": 90}]
+
+
+def test_streams_events_and_reconnects_with_backoff(api, sleeps):
+    api.responses["/watch/stream/T"] = [
+        events(b'data: {"n": 1}\n\n', b'data: {"n": 2}\n\n'),
+        httpx.Response(503),
+        httpx.Response(429),
+        events(b'data: {"n": 3}\n\n'),
+    ]
+
+    assert watch(3) == [{"n": 1}, {"n": 2}, {"n": 3}]
+    # The backoff doubles across failures and resets once an event arrives.
+    assert sleeps == [1.0, 2.0, 4.0]
+    assert api.requests[0].url.params["chain"] == "base"
+    assert api.requests[0].headers["Accept"] == "text/event-stream"
+
+
+def test_backoff_is_capped(api, sleeps):
+    api.responses["/watch/stream/T"] = [httpx.Response(503)] * 9 + [events(b'data: {"n": 1}\n\n')]
+
+    assert watch(1) == [{"n": 1}]
+    assert sleeps == [1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 60.0, 60.0, 60.0]
+
+
+def test_client_errors_stop_the_stream(api, sleeps):
+    api.responses["/watch/stream/T"] = httpx.Response(403)
+
+    (event,) = watch()
+
+    assert not event["success"] and "403" in event["error"]
+    assert sleeps == []
+
+
+def test_payment_required_stops_the_stream(api, sleeps):
+    api.responses["/watch/stream/T"] = httpx.Response(402)
+
+    assert watch() == [{"success": False, "error": "Payment required (HTTP 402). Set RUG_MUNCH_API_KEY or use x402 payment."}]
+
+
+def test_falls_back_to_polling_without_a_stream(api, sleeps):
+    api.responses["/watch/stream/T"] = httpx.Response(404)
+    api.responses["/check-risk"] = [
+        httpx.Response(200, json={"risk_score": 10}),
+        httpx.Response(200, json={"risk_score": 10}),
+        httpx.Response(200, json={"risk_score": 10}),
+        httpx.Response(200, json={"risk_score": 80}),
+    ]
+
+    assert watch(2) == [{"success": True, "risk_score": 10}, {"success": True, "risk_score": 80}]
+    assert api.paths == ["/watch/stream/T"] + ["/check-risk"] * 4
+    assert api.bodies("/check-risk")[0] == {"token_address": "T", "chain": "base"}
+    # Unchanged polls double the interval; a change resets it.
+    assert sleeps == [5.0, 10.0, 20.0]